@@ -168,7 +168,9 @@ class Downloader:
             for scan_format in self.scan_formats:
                 logger.debug("Scanning for %s files", scan_format)
 
-                found_files = gather_known_songs(self.settings["output"], scan_format)
+                found_files = gather_known_songs(
+                    self.settings["output"], scan_format, self.settings["threads"]
+                )
 
                 logger.debug("Found %s %s files", len(found_files), scan_format)
 
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple
 
 from spotdl.types.song import Song, SongList
-from spotdl.utils.spotify import SpotifyClient
+from spotdl.utils.spotify import SpotifyClient, iter_spotify_items
 
 __all__ = ["Playlist", "PlaylistError"]
 
@@ -73,17 +73,8 @@ class Playlist(SongList):
         if playlist_response is None:
             raise PlaylistError(f"Wrong playlist id: {url}")
 
-        # Get all tracks from playlist
-        tracks = playlist_response["items"]
-        while playlist_response["next"]:
-            playlist_response = spotify_client.next(playlist_response)
-
-            # Failed to get response, break the loop
-            if playlist_response is None:
-                break
-
-            # Add tracks to the list
-            tracks.extend(playlist_response["items"])
+        # Get all tracks from playlist, page by page
+        tracks = iter_spotify_items(playlist_response)
 
         songs = []
         for track_no, track in enumerate(tracks):
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple
 
 from spotdl.types.song import Song, SongList
-from spotdl.utils.spotify import SpotifyClient
+from spotdl.utils.spotify import SpotifyClient, iter_spotify_items
 
 __all__ = ["Saved", "SavedError"]
 
@@ -46,16 +46,8 @@ class Saved(SongList):
         if saved_tracks_response is None:
             raise SavedError("Couldn't get saved tracks")
 
-        saved_tracks = saved_tracks_response["items"]
-
-        # Fetch all saved tracks
-        while saved_tracks_response and saved_tracks_response["next"]:
-            response = spotify_client.next(saved_tracks_response)
-            if response is None:
-                break
-
-            saved_tracks_response = response
-            saved_tracks.extend(saved_tracks_response["items"])
+        # Fetch all saved tracks, page by page
+        saved_tracks = iter_spotify_items(saved_tracks_response)
 
         songs = []
         for track in saved_tracks:
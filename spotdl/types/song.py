@@ -88,7 +88,7 @@ class Song:
                 "Couldn't get metadata, check if you have passed correct track id"
             )
 
-        if raw_track_meta["duration_ms"] == 0 or raw_track_meta["name"].strip() == "":
+        if not cls.track_exists(raw_track_meta):
             raise SongError(f"Track no longer exists: {url}")
 
         # get artist info
@@ -99,13 +99,34 @@ class Song:
         album_id = raw_track_meta["album"]["id"]
         raw_album_meta: Dict[str, Any] = spotify_client.album(album_id)  # type: ignore
 
+        return cls.from_raw_metadata(raw_track_meta, raw_artist_meta, raw_album_meta)
+
+    @classmethod
+    def from_raw_metadata(
+        cls,
+        raw_track_meta: Dict[str, Any],
+        raw_artist_meta: Dict[str, Any],
+        raw_album_meta: Dict[str, Any],
+    ) -> "Song":
+        """
+        Creates a Song object from raw Spotify API responses.
+
+        ### Arguments
+        - raw_track_meta: The track response.
+        - raw_artist_meta: The response for the primary artist of the track.
+        - raw_album_meta: The response for the album of the track.
+
+        ### Returns
+        - The Song object.
+        """
+
         # create song object
         return cls(
             name=raw_track_meta["name"],
             artists=[artist["name"] for artist in raw_track_meta["artists"]],
             artist=raw_track_meta["artists"][0]["name"],
-            artist_id=primary_artist_id,
-            album_id=album_id,
+            artist_id=raw_artist_meta["id"],
+            album_id=raw_album_meta["id"],
             album_name=raw_album_meta["name"],
             album_artist=raw_album_meta["artists"][0]["name"],
             album_type=raw_album_meta.get("album_type"),
@@ -137,6 +158,23 @@ class Song:
             ),
         )
 
+    @staticmethod
+    def track_exists(raw_track_meta: Dict[str, Any]) -> bool:
+        """
+        Checks if a raw Spotify track still exists,
+        removed tracks have no duration or an empty name.
+
+        ### Arguments
+        - raw_track_meta: The track response.
+
+        ### Returns
+        - True if the track exists.
+        """
+
+        return (
+            raw_track_meta["duration_ms"] != 0 and raw_track_meta["name"].strip() != ""
+        )
+
     @staticmethod
     def search(search_term: str):
         """
@@ -0,0 +1,232 @@
+"""
+Module for fetching many songs and song lists at once,
+using shared thread pools and the Spotify API batch endpoints.
+
+To use this module you must first initialize the SpotifyClient.
+"""
+
+import concurrent.futures
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+
+from spotdl.types.song import Song, SongList
+from spotdl.utils.spotify import get_spotify_objects
+
+__all__ = [
+    "MAX_POOL_THREADS",
+    "MAX_SPOTIFY_THREADS",
+    "get_thread_pool",
+    "search_song",
+    "get_song_from_search_term",
+    "lists_from_urls",
+    "merge_song_data",
+    "reinit_songs_in_batches",
+]
+
+logger = logging.getLogger(__name__)
+thread_pools: Dict[int, concurrent.futures.ThreadPoolExecutor] = {}
+
+# Upper bound for the number of threads in a shared thread pool
+MAX_POOL_THREADS = 32
+
+# Maximum number of concurrent Spotify requests made when fetching
+# the user's library lists or the songs of a YouTube Music list
+MAX_SPOTIFY_THREADS = 10
+
+# Names of the Song fields, in definition order
+SONG_FIELDS = tuple(Song.__dataclass_fields__)  # pylint: disable=E1101
+
+SongListT = TypeVar("SongListT", bound=SongList)
+
+
+def get_thread_pool(threads: int) -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Lazily initialize a thread pool shared by the search functions.
+    One pool is kept for every requested number of threads.
+
+    ### Arguments
+    - threads: number of worker threads, capped at `MAX_POOL_THREADS`
+
+    ### Returns
+    - the thread pool
+    """
+
+    threads = max(1, min(MAX_POOL_THREADS, threads))
+    pool = thread_pools.get(threads)
+    if pool is None:
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="spotdl-search"
+        )
+        thread_pools[threads] = pool
+
+    return pool
+
+
+@lru_cache(maxsize=4096)
+def search_song(search_term: str) -> Song:
+    """
+    Searches Spotify for the song best matching a search term.
+    Results are cached for the lifetime of the process, so repeated
+    searches don't hit the network again. Only used to fill in songs
+    from other sources, queries typed by the user are always searched.
+    Use `get_song_from_search_term` to get a copy that can be modified.
+
+    ### Arguments
+    - search_term: the search term to use
+
+    ### Returns
+    - the cached Song object
+    """
+
+    return Song.from_search_term(search_term)
+
+
+def get_song_from_search_term(search_term: str) -> Song:
+    """
+    Creates a Song object from a search term, using cached
+    search results for search terms that were already used.
+
+    ### Arguments
+    - search_term: the search term to use
+
+    ### Returns
+    - a new Song object
+    """
+
+    # Copy the cached song, so that changes to it don't end up in the cache
+    return Song.from_dict(search_song(search_term).json)
+
+
+def lists_from_urls(list_class: Type[SongListT], urls: List[str]) -> List[SongListT]:
+    """
+    Create song lists from their urls, without fetching their songs.
+    Every list needs its own request, so they are fetched concurrently.
+
+    ### Arguments
+    - list_class: the song list class to create
+    - urls: the urls of the lists
+
+    ### Returns
+    - the song lists, in the same order as the urls
+    """
+
+    if len(urls) > 1:
+        return list(
+            get_thread_pool(MAX_SPOTIFY_THREADS).map(
+                lambda url: list_class.from_url(url, fetch_songs=False), urls
+            )
+        )
+
+    return [list_class.from_url(url, fetch_songs=False) for url in urls]
+
+
+def merge_song_data(data: Dict[str, Any], new_data: Dict[str, Any]) -> Song:
+    """
+    Fill in the missing song data with new data,
+    values that are already set are kept.
+
+    ### Arguments
+    - data: the song data to update
+    - new_data: the new song data
+
+    ### Returns
+    - Updated song object
+    """
+
+    merged_data: Dict[str, Any] = {
+        key: data[key] if data.get(key) is not None else new_data.get(key)
+        for key in SONG_FIELDS
+    }
+
+    # return reinitialized song object
+    return Song(**merged_data)
+
+
+def reinit_songs_in_batches(
+    songs: List[Song], threads: int, fallback: Callable[[Song], Song]
+) -> List[Song]:
+    """
+    Update song objects with new data from Spotify.
+    Songs with a Spotify track id are fetched with the batch endpoints
+    of the Spotify API, the rest are updated one by one with `fallback`.
+
+    ### Arguments
+    - songs: List of song objects
+    - threads: Number of threads to use (at most `MAX_POOL_THREADS`)
+    - fallback: function that updates a single song
+
+    ### Returns
+    - List of updated song objects, songs that couldn't be updated are skipped
+    """
+
+    threads = max(1, min(MAX_POOL_THREADS, threads))
+    pool = get_thread_pool(threads)
+
+    track_ids: Dict[int, str] = {}
+    for index, song in enumerate(songs):
+        if song.url and "open.spotify.com/track/" in song.url:
+            track_ids[index] = song.url.partition("/track/")[2].partition("?")[0]
+        elif song.song_id:
+            track_ids[index] = song.song_id
+
+    tracks = get_spotify_objects(pool, "tracks", list(track_ids.values()))
+
+    # Keyed by the requested ids, relinked tracks can have a different id
+    valid_tracks: Dict[str, Dict[str, Any]] = {
+        track_id: track
+        for track_id, track in tracks.items()
+        if track is not None and Song.track_exists(track)
+    }
+
+    artists = get_spotify_objects(
+        pool, "artists", [track["artists"][0]["id"] for track in valid_tracks.values()]
+    )
+    albums = get_spotify_objects(
+        pool, "albums", [track["album"]["id"] for track in valid_tracks.values()]
+    )
+
+    results: List[Optional[Song]] = [None] * len(songs)
+    for index, track_id in track_ids.items():
+        track = valid_tracks.get(track_id)
+        if track is None:
+            continue
+
+        artist = artists.get(track["artists"][0]["id"])
+        album = albums.get(track["album"]["id"])
+        if artist is None or album is None:
+            continue
+
+        try:
+            new_data = vars(Song.from_raw_metadata(track, artist, album))
+        except Exception as exc:
+            logger.debug("Couldn't create song from batch data: %s", exc)
+            continue
+
+        results[index] = merge_song_data(songs[index].json, new_data)
+
+    # Limit the number of queued tasks, submitting blocks until a slot is free
+    slots = threading.BoundedSemaphore(threads * 4)
+
+    # Songs that weren't updated in batches
+    future_to_index = {}
+    for index, song in enumerate(songs):
+        if results[index] is not None:
+            continue
+
+        slots.acquire()  # pylint: disable=consider-using-with
+        future = pool.submit(fallback, song)
+        future.add_done_callback(lambda _: slots.release())
+        future_to_index[future] = index
+
+    for future in concurrent.futures.as_completed(future_to_index):
+        index = future_to_index[future]
+        try:
+            results[index] = future.result()
+        except Exception as exc:
+            logger.error(
+                "%s generated an exception: %s", songs[index].display_name, exc
+            )
+
+    return [song for song in results if song is not None]
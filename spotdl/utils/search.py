@@ -5,12 +5,24 @@ or by parsing a query.
 To use this module you must first initialize the SpotifyClient.
 """
 
-import concurrent.futures
+import dataclasses
 import json
 import logging
 import re
+from collections import defaultdict
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
 
 import requests
 from ytmusicapi import YTMusic
@@ -20,16 +32,35 @@ from spotdl.types.artist import Artist
 from spotdl.types.playlist import Playlist
 from spotdl.types.saved import Saved
 from spotdl.types.song import Song, SongList
+from spotdl.utils.batch import (
+    MAX_SPOTIFY_THREADS,
+    get_song_from_search_term,
+    get_thread_pool,
+    lists_from_urls,
+    merge_song_data,
+    reinit_songs_in_batches,
+)
 from spotdl.utils.metadata import get_file_metadata
-from spotdl.utils.spotify import SpotifyClient, SpotifyError
+from spotdl.utils.spotify import (
+    SpotifyClient,
+    SpotifyError,
+    iter_spotify_items,
+    iter_spotify_pages,
+)
 
 __all__ = [
     "QueryError",
+    "classify_query",
+    "get_spotify_url_type",
     "get_search_results",
+    "resolve_spotify_share_link",
     "parse_query",
     "get_simple_songs",
+    "filter_songs",
     "reinit_song",
+    "reinit_songs",
     "get_song_from_file_metadata",
+    "get_song_from_file",
     "gather_known_songs",
     "create_ytm_album",
     "create_ytm_playlist",
@@ -38,9 +69,64 @@ __all__ = [
 ]
 
 logger = logging.getLogger(__name__)
-client = None  # pylint: disable=invalid-name
-
 
+# Maximum number of share links resolved at the same time
+MAX_SHARE_LINK_THREADS = 16
+
+SPOTIFY_SHARE_LINK_PREFIX = "https://spotify.link/"
+
+# Literal substrings used to decide how a query should be handled
+QUERY_TOKENS = (
+    "|",
+    "watch?v=",
+    "youtu.be/",
+    "soundcloud.com/",
+    "bandcamp.com/",
+    "music.youtube.com/watch?v",
+    "youtube.com/playlist?list=",
+    "youtube.com/browse/VLPL",
+    "browse/VLPL",
+    "?list=PL",
+    "?list=OLAK5uy_",
+    SPOTIFY_SHARE_LINK_PREFIX,
+    "open.spotify.com",
+    "track",
+    "playlist",
+    "album",
+    "artist",
+    "user",
+    "album:",
+    "playlist:",
+    "artist:",
+)
+
+# Groups of query tokens checked together while dispatching a query
+AUDIO_PROVIDER_TOKENS = frozenset(
+    ("watch?v=", "youtu.be/", "soundcloud.com/", "bandcamp.com/")
+)
+YTM_LIST_TOKENS = frozenset(("youtube.com/playlist?list=", "youtube.com/browse/VLPL"))
+YTM_PLAYLIST_TOKENS = frozenset(("?list=PL", "browse/VLPL"))
+
+# Locale part of Spotify URLs, e.g. https://open.spotify.com/intl-de/track/...
+SPOTIFY_INTL_REGEX = re.compile(r"/intl-[^/]+/")
+
+# YouTube URLs that are rewritten to YouTube Music URLs
+YOUTUBE_URL_REGEX = re.compile(r"https://(?:www\.)?youtube\.com/")
+
+# YouTube Music playlist or album list ids
+YTM_LIST_REGEX = re.compile(r"\?list=(?:PL|OLAK5uy_)|browse/VLPL")
+
+# Valid YouTube Music album and playlist urls, capturing the list id
+YTM_ALBUM_URL_REGEX = re.compile(r"https://music\.youtube\.com/.*?\?list=([^&]*)")
+YTM_PLAYLIST_URL_REGEX = re.compile(
+    r"https://music\.youtube\.com/(?:(?:.*?/)?browse/(VLPL[^?&]*)|.*?\?list=([^&]*))"
+)
+
+# Supported Spotify URL types, in the order they are matched
+SPOTIFY_URL_TYPES = ("track", "playlist", "album", "artist", "user")
+
+
+@lru_cache(maxsize=1)
 def get_ytm_client() -> YTMusic:
     """
     Lazily initialize the YTMusic client.
@@ -49,11 +135,26 @@ def get_ytm_client() -> YTMusic:
     - the YTMusic client
     """
 
-    global client  # pylint: disable=global-statement
-    if client is None:
-        client = YTMusic()
+    return YTMusic()
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """
+    Lazily initialize the HTTP session used to resolve share links,
+    so that connections are reused between requests.
+
+    ### Returns
+    - the requests session
+    """
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=MAX_SHARE_LINK_THREADS, pool_maxsize=MAX_SHARE_LINK_THREADS
+    )
+    session.mount("https://", adapter)
 
-    return client
+    return session
 
 
 class QueryError(Exception):
@@ -62,6 +163,47 @@ class QueryError(Exception):
     """
 
 
+def classify_query(request: str) -> FrozenSet[str]:
+    """
+    Find all the query tokens present in the request,
+    so that every token is searched for only once per request.
+
+    ### Arguments
+    - request: the query to classify
+
+    ### Returns
+    - a set of tokens from `QUERY_TOKENS` that are present in the request
+    """
+
+    return frozenset(token for token in QUERY_TOKENS if token in request)
+
+
+def get_spotify_url_type(request: str, tokens: FrozenSet[str]) -> Optional[str]:
+    """
+    Get the type of a Spotify URL from its path.
+
+    ### Arguments
+    - request: the query
+    - tokens: the query tokens returned by `classify_query`
+
+    ### Returns
+    - one of `SPOTIFY_URL_TYPES` or None if the request is not a Spotify URL
+    """
+
+    if "open.spotify.com" not in tokens:
+        return None
+
+    # https://open.spotify.com/track/... -> "track"
+    url_type = request.partition("open.spotify.com/")[2].partition("/")[0]
+    if url_type in SPOTIFY_URL_TYPES:
+        return url_type
+
+    # Fall back to looking for the type anywhere in the request
+    return next(
+        (url_type for url_type in SPOTIFY_URL_TYPES if url_type in tokens), None
+    )
+
+
 def get_search_results(search_term: str) -> List[Song]:
     """
     Creates a list of Song objects from a search term.
@@ -76,6 +218,22 @@ def get_search_results(search_term: str) -> List[Song]:
     return Song.list_from_search_term(search_term)
 
 
+@lru_cache(maxsize=512)
+def resolve_spotify_share_link(share_link: str) -> str:
+    """
+    Resolves a spotify.link share link to the full Spotify URL.
+    Results are cached, so repeated links don't hit the network again.
+
+    ### Arguments
+    - share_link: the share link to resolve
+
+    ### Returns
+    - the URL the share link redirects to
+    """
+
+    return get_session().head(share_link, allow_redirects=True, timeout=10).url
+
+
 def parse_query(
     query: List[str],
     threads: int = 1,
@@ -89,7 +247,7 @@ def parse_query(
 
     ### Arguments
     - query: List of strings containing query
-    - threads: Number of threads to use
+    - threads: Number of threads to use (at most `MAX_POOL_THREADS`)
 
     ### Returns
     - List of song objects
@@ -103,17 +261,7 @@ def parse_query(
         playlist_retain_track_cover=playlist_retain_track_cover,
     )
 
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-        future_to_song = {executor.submit(reinit_song, song): song for song in songs}
-        for future in concurrent.futures.as_completed(future_to_song):
-            song = future_to_song[future]
-            try:
-                results.append(future.result())
-            except Exception as exc:
-                logger.error("%s generated an exception: %s", song.display_name, exc)
-
-    return results
+    return reinit_songs(songs, threads)
 
 
 def get_simple_songs(
@@ -134,26 +282,39 @@ def get_simple_songs(
     - List of simple song objects
     """
 
+    # Process every query only once, keeping the order they were passed in
+    query = list(dict.fromkeys(query))
+
+    # Resolve all the share links at once, results are cached
+    share_links = [request for request in query if SPOTIFY_SHARE_LINK_PREFIX in request]
+    if len(share_links) > 1:
+        # Create the session up front, so the threads don't race to create it
+        get_session()
+        list(
+            get_thread_pool(MAX_SHARE_LINK_THREADS).map(
+                resolve_spotify_share_link, share_links
+            )
+        )
+
     songs: List[Song] = []
     lists: List[SongList] = []
     for request in query:
         logger.info("Processing query: %s", request)
 
         # Remove /intl-xxx/ from Spotify URLs with regex
-        request = re.sub(r"\/intl-\w+\/", "/", request)
+        if "/intl-" in request:
+            request = SPOTIFY_INTL_REGEX.sub("/", request)
+        tokens = classify_query(request)
+        spotify_url_type = get_spotify_url_type(request, tokens)
+        split_urls = request.split("|") if "|" in tokens else [request]
 
+        # Cheapest and most selective checks come first
         if (
-            (  # pylint: disable=too-many-boolean-expressions
-                "watch?v=" in request
-                or "youtu.be/" in request
-                or "soundcloud.com/" in request
-                or "bandcamp.com/" in request
-            )
-            and "open.spotify.com" in request
-            and "track" in request
-            and "|" in request
+            "|" in tokens
+            and "open.spotify.com" in tokens
+            and "track" in tokens
+            and not AUDIO_PROVIDER_TOKENS.isdisjoint(tokens)
         ):
-            split_urls = request.split("|")
             if (
                 len(split_urls) <= 1
                 or not (
@@ -171,8 +332,8 @@ def get_simple_songs(
             songs.append(
                 Song.from_missing_data(url=split_urls[1], download_url=split_urls[0])
             )
-        elif "music.youtube.com/watch?v" in request:
-            track_data = get_ytm_client().get_song(request.split("?v=", 1)[1])
+        elif "music.youtube.com/watch?v" in tokens:
+            track_data = get_ytm_client().get_song(request.partition("?v=")[2])
 
             yt_song = Song.from_search_term(
                 f"{track_data['videoDetails']['author']} - {track_data['videoDetails']['title']}"
@@ -186,72 +347,65 @@ def get_simple_songs(
 
             yt_song.download_url = request
             songs.append(yt_song)
-        elif (
-            "youtube.com/playlist?list=" in request
-            or "youtube.com/browse/VLPL" in request
-        ):
-            request = request.replace(
-                "https://www.youtube.com/", "https://music.youtube.com/"
-            )
-            request = request.replace(
-                "https://youtube.com/", "https://music.youtube.com/"
-            )
+        elif not YTM_LIST_TOKENS.isdisjoint(tokens):
+            ytm_url = YOUTUBE_URL_REGEX.sub("https://music.youtube.com/", split_urls[0])
 
-            split_urls = request.split("|")
             if len(split_urls) == 1:
-                if "?list=OLAK5uy_" in request:
-                    lists.append(create_ytm_album(request, fetch_songs=False))
-                elif "?list=PL" in request or "browse/VLPL" in request:
-                    lists.append(create_ytm_playlist(request, fetch_songs=False))
+                if "?list=OLAK5uy_" in tokens:
+                    lists.append(create_ytm_album(ytm_url, fetch_songs=False))
+                elif not YTM_PLAYLIST_TOKENS.isdisjoint(tokens):
+                    lists.append(create_ytm_playlist(ytm_url, fetch_songs=False))
             else:
-                if ("spotify" not in split_urls[1]) or not any(
-                    x in split_urls[0]
-                    for x in ["?list=PL", "?list=OLAK5uy_", "browse/VLPL"]
-                ):
+                if "spotify" not in split_urls[1] or not YTM_LIST_REGEX.search(ytm_url):
                     raise QueryError(
                         'Incorrect format used, please use "YouTubeMusicURL|SpotifyURL". '
                         "Currently only supports YouTube Music playlists and albums."
                     )
 
-                if ("open.spotify.com" in request and "album" in request) and (
-                    "?list=OLAK5uy_" in request
-                ):
-                    ytm_list: SongList = create_ytm_album(
-                        split_urls[0], fetch_songs=False
-                    )
-                    spot_list = Album.from_url(split_urls[1], fetch_songs=False)
-                elif ("open.spotify.com" in request and "playlist" in request) and (
-                    "?list=PL" in request or "browse/VLPL" in request
+                create_ytm_list: Callable[..., SongList]
+                spot_list_type: Type[SongList]
+                if spotify_url_type == "album" and "?list=OLAK5uy_" in tokens:
+                    create_ytm_list, spot_list_type = create_ytm_album, Album
+                elif spotify_url_type == "playlist" and not (
+                    YTM_PLAYLIST_TOKENS.isdisjoint(tokens)
                 ):
-                    ytm_list = create_ytm_playlist(split_urls[0], fetch_songs=False)
-                    spot_list = Playlist.from_url(split_urls[1], fetch_songs=False)
+                    create_ytm_list, spot_list_type = create_ytm_playlist, Playlist
                 else:
                     raise QueryError(
-                        f"URLs are not of the same type, {split_urls[0]} is not "
+                        f"URLs are not of the same type, {ytm_url} is not "
                         f"the same type as {split_urls[1]}."
                     )
 
-                if ytm_list.length != spot_list.length:
+                # Both lists are independent, fetch them at the same time
+                pool = get_thread_pool(2)
+                ytm_future = pool.submit(create_ytm_list, ytm_url, fetch_songs=False)
+                spot_future = pool.submit(
+                    spot_list_type.from_url, split_urls[1], fetch_songs=False
+                )
+                ytm_list = ytm_future.result()
+                spot_list = spot_future.result()
+
+                ytm_length, spot_length = ytm_list.length, spot_list.length
+                if ytm_length != spot_length:
                     raise QueryError(
-                        f"The YouTube Music ({ytm_list.length}) "
-                        f"and Spotify ({spot_list.length}) lists have different lengths. "
+                        f"The YouTube Music ({ytm_length}) "
+                        f"and Spotify ({spot_length}) lists have different lengths. "
                     )
 
                 if use_ytm_data:
-                    for index, song in enumerate(ytm_list.songs):
-                        song.url = spot_list.songs[index].url
+                    for ytm_song, spot_song in zip(ytm_list.songs, spot_list.songs):
+                        ytm_song.url = spot_song.url
 
                     lists.append(ytm_list)
                 else:
-                    for index, song in enumerate(spot_list.songs):
-                        song.download_url = ytm_list.songs[index].download_url
+                    for spot_song, ytm_song in zip(spot_list.songs, ytm_list.songs):
+                        spot_song.download_url = ytm_song.download_url
 
                     lists.append(spot_list)
-        elif "open.spotify.com" in request and "track" in request:
+        elif spotify_url_type == "track":
             songs.append(Song.from_url(url=request))
-        elif "https://spotify.link/" in request:
-            resp = requests.head(request, allow_redirects=True, timeout=10)
-            full_url = resp.url
+        elif SPOTIFY_SHARE_LINK_PREFIX in tokens:
+            full_url = resolve_spotify_share_link(request)
             full_lists = get_simple_songs(
                 [full_url],
                 use_ytm_data=use_ytm_data,
@@ -260,35 +414,29 @@ def get_simple_songs(
                 playlist_retain_track_cover=playlist_retain_track_cover,
             )
             songs.extend(full_lists)
-        elif "open.spotify.com" in request and "playlist" in request:
+        elif spotify_url_type == "playlist":
             lists.append(Playlist.from_url(request, fetch_songs=False))
-        elif "open.spotify.com" in request and "album" in request:
+        elif spotify_url_type == "album":
             lists.append(Album.from_url(request, fetch_songs=False))
-        elif "open.spotify.com" in request and "artist" in request:
+        elif spotify_url_type == "artist":
             lists.append(Artist.from_url(request, fetch_songs=False))
-        elif "open.spotify.com" in request and "user" in request:
+        elif spotify_url_type == "user":
             lists.extend(get_all_user_playlists(request))
-        elif "album:" in request:
+        elif "album:" in tokens:
             lists.append(Album.from_search_term(request, fetch_songs=False))
-        elif "playlist:" in request:
+        elif "playlist:" in tokens:
             lists.append(Playlist.from_search_term(request, fetch_songs=False))
-        elif "artist:" in request:
+        elif "artist:" in tokens:
             lists.append(Artist.from_search_term(request, fetch_songs=False))
         elif request == "saved":
             lists.append(Saved.from_url(request, fetch_songs=False))
-        elif request == "all-user-playlists":
-            lists.extend(get_all_user_playlists())
-        elif request == "all-user-followed-artists":
-            lists.extend(get_user_followed_artists())
-        elif request == "all-user-saved-albums":
-            lists.extend(get_user_saved_albums())
-        elif request == "all-saved-playlists":
-            lists.extend(get_all_saved_playlists())
+        elif request in USER_LIBRARY_QUERIES:
+            lists.extend(USER_LIBRARY_QUERIES[request]())
         elif request.endswith(".spotdl"):
-            with open(request, "r", encoding="utf-8") as save_file:
-                for track in json.load(save_file):
-                    # Append to songs
-                    songs.append(Song.from_dict(track))
+            with open(request, "rb") as save_file:
+                tracks = json.loads(save_file.read())
+
+            songs.extend(Song.from_dict(track) for track in tracks)
         else:
             songs.append(Song.from_search_term(request))
 
@@ -300,59 +448,90 @@ def get_simple_songs(
             song_list.__class__.__name__,
         )
 
-        for index, song in enumerate(song_list.songs):
-            song_data = song.json
-            song_data["list_name"] = song_list.name
-            song_data["list_url"] = song_list.url
-            song_data["list_position"] = song.list_position
-            song_data["list_length"] = song_list.length
-
-            if playlist_numbering:
-                song_data["track_number"] = song_data["list_position"]
-                song_data["tracks_count"] = song_data["list_length"]
-                song_data["album_name"] = song_data["list_name"]
-                song_data["disc_number"] = 1
-                song_data["disc_count"] = 1
-                if isinstance(song_list, Playlist):
-                    song_data["album_artist"] = song_list.author_name
-                    song_data["cover_url"] = song_list.cover_url
-
-            if playlist_retain_track_cover:
-                song_data["track_number"] = song_data["list_position"]
-                song_data["tracks_count"] = song_data["list_length"]
-                song_data["album_name"] = song_data["list_name"]
-                song_data["disc_number"] = 1
-                song_data["disc_count"] = 1
-                song_data["cover_url"] = song_data["cover_url"]
-                if isinstance(song_list, Playlist):
-                    song_data["album_artist"] = song_list.author_name
-
-            songs.append(Song.from_dict(song_data))
-
-    # removing songs for --ignore-albums
-    original_length = len(songs)
+        # The list data is the same for every song, so build it once
+        list_changes: Dict[str, Any] = {
+            "list_name": song_list.name,
+            "list_url": song_list.url,
+            "list_length": song_list.length,
+        }
+
+        renumber = playlist_numbering or playlist_retain_track_cover
+        if renumber:
+            list_changes["tracks_count"] = song_list.length
+            list_changes["album_name"] = song_list.name
+            list_changes["disc_number"] = 1
+            list_changes["disc_count"] = 1
+            if isinstance(song_list, Playlist):
+                list_changes["album_artist"] = song_list.author_name
+                if playlist_numbering:
+                    list_changes["cover_url"] = song_list.cover_url
+
+        for song in song_list.songs:
+            # Copy the song with the list data set, instead of
+            # serializing it to a dict and back
+            changes = list_changes
+            if renumber:
+                changes = {**list_changes, "track_number": song.list_position}
+
+            songs.append(dataclasses.replace(song, **changes))
+
+    # removing songs for --ignore-albums and --album-type
+    if albums_to_ignore or album_type:
+        songs = filter_songs(songs, albums_to_ignore, album_type)
+
+    logger.debug("Found %s songs in %s lists", len(songs), len(lists))
+
+    return songs
+
+
+def filter_songs(
+    songs: List[Song],
+    albums_to_ignore: Optional[List[str]] = None,
+    album_type: Optional[str] = None,
+) -> List[Song]:
+    """
+    Remove songs from ignored albums and songs of other album types,
+    in a single pass over the songs.
+
+    ### Arguments
+    - songs: List of songs to filter
+    - albums_to_ignore: keywords of album names to skip, matched case-insensitively
+    - album_type: the album type to keep, all types are kept if not set
+
+    ### Returns
+    - List of the remaining songs
+    """
+
+    # One case-insensitive alternation instead of a lowercased
+    # copy and a substring scan per keyword for every song
+    ignore_regex = (
+        re.compile(
+            "|".join(re.escape(keyword) for keyword in albums_to_ignore),
+            re.IGNORECASE,
+        )
+        if albums_to_ignore
+        else None
+    )
+
+    ignored_songs = 0
+    filtered_songs = []
+    for song in songs:
+        if ignore_regex is not None and ignore_regex.search(song.album_name):
+            ignored_songs += 1
+        elif not album_type or song.album_type == album_type:
+            filtered_songs.append(song)
+
     if albums_to_ignore:
-        songs = [
-            song
-            for song in songs
-            if all(
-                keyword not in song.album_name.lower() for keyword in albums_to_ignore
-            )
-        ]
-        logger.info("Skipped %s songs (Ignored albums)", (original_length - len(songs)))
+        logger.info("Skipped %s songs (Ignored albums)", ignored_songs)
 
     if album_type:
-        songs = [song for song in songs if song.album_type == album_type]
-
         logger.info(
             "Skipped %s songs for Album Type %s",
-            (original_length - len(songs)),
+            (len(songs) - len(filtered_songs)),
             album_type,
         )
 
-    logger.debug("Found %s songs in %s lists", len(songs), len(lists))
-
-    return songs
+    return filtered_songs
 
 
 def songs_from_albums(albums: List[str]):
@@ -370,7 +549,7 @@ def songs_from_albums(albums: List[str]):
     for album_id in albums:
         album = Album.from_url(album_id, fetch_songs=False)
 
-        songs.extend([Song.from_missing_data(**song.json) for song in album.songs])
+        songs.extend(Song.from_missing_data(**song.json) for song in album.songs)
 
     return songs
 
@@ -394,37 +573,36 @@ def get_all_user_playlists(user_url: str = "") -> List[Playlist]:
     if user_url and not user_url.startswith("https://open.spotify.com/user/"):
         raise ValueError(f"Invalid user profile url: {user_url}")
 
-    user_id = user_url.split("https://open.spotify.com/user/")[-1].replace("/", "")
+    user_id = user_url.removeprefix("https://open.spotify.com/user/").replace("/", "")
 
+    fetch_playlists: Callable[..., Optional[Dict[str, Any]]]
     if user_id:
-        user_playlists_response = spotify_client.user_playlists(user_id)
+        fetch_playlists = partial(spotify_client.user_playlists, user_id)
     else:
-        user_playlists_response = spotify_client.current_user_playlists()
+        fetch_playlists = spotify_client.current_user_playlists
         user_resp = spotify_client.current_user()
         if user_resp is None:
             raise SpotifyError("Couldn't get user info")
 
         user_id = user_resp["id"]
 
+    user_playlists_response = fetch_playlists()
     if user_playlists_response is None:
         raise SpotifyError("Couldn't get user playlists")
 
-    user_playlists = user_playlists_response["items"]
-
-    # Fetch all saved tracks
-    while user_playlists_response and user_playlists_response["next"]:
-        response = spotify_client.next(user_playlists_response)
-        if response is None:
-            break
-
-        user_playlists_response = response
-        user_playlists.extend(user_playlists_response["items"])
-
-    return [
-        Playlist.from_url(playlist["external_urls"]["spotify"], fetch_songs=False)
-        for playlist in user_playlists
-        if playlist["owner"]["id"] == user_id
-    ]
+    # Filter the playlists page by page, as they are fetched
+    return lists_from_urls(
+        Playlist,
+        [
+            playlist["external_urls"]["spotify"]
+            for playlist in iter_spotify_pages(
+                get_thread_pool(MAX_SPOTIFY_THREADS),
+                fetch_playlists,
+                user_playlists_response,
+            )
+            if playlist["owner"]["id"] == user_id
+        ],
+    )
 
 
 def get_user_saved_albums() -> List[Album]:
@@ -443,21 +621,17 @@ def get_user_saved_albums() -> List[Album]:
     if user_saved_albums_response is None:
         raise SpotifyError("Couldn't get user saved albums")
 
-    user_saved_albums = user_saved_albums_response["items"]
-
-    # Fetch all saved tracks
-    while user_saved_albums_response and user_saved_albums_response["next"]:
-        response = spotify_client.next(user_saved_albums_response)
-        if response is None:
-            break
-
-        user_saved_albums_response = response
-        user_saved_albums.extend(user_saved_albums_response["items"])
-
-    return [
-        Album.from_url(item["album"]["external_urls"]["spotify"], fetch_songs=False)
-        for item in user_saved_albums
-    ]
+    return lists_from_urls(
+        Album,
+        [
+            item["album"]["external_urls"]["spotify"]
+            for item in iter_spotify_pages(
+                get_thread_pool(MAX_SPOTIFY_THREADS),
+                spotify_client.current_user_saved_albums,
+                user_saved_albums_response,
+            )
+        ],
+    )
 
 
 def get_user_followed_artists() -> List[Artist]:
@@ -476,22 +650,17 @@ def get_user_followed_artists() -> List[Artist]:
     if user_followed_response is None:
         raise SpotifyError("Couldn't get user followed artists")
 
-    user_followed_response = user_followed_response["artists"]
-    user_followed = user_followed_response["items"]
-
-    # Fetch all artists
-    while user_followed_response and user_followed_response["next"]:
-        response = spotify_client.next(user_followed_response)
-        if response is None:
-            break
-
-        user_followed_response = response["artists"]
-        user_followed.extend(user_followed_response["items"])
-
-    return [
-        Artist.from_url(followed_artist["external_urls"]["spotify"], fetch_songs=False)
-        for followed_artist in user_followed
-    ]
+    # The artists are paged with a cursor, so the pages can only be
+    # fetched one after another. They are nested under "artists".
+    return lists_from_urls(
+        Artist,
+        [
+            followed_artist["external_urls"]["spotify"]
+            for followed_artist in iter_spotify_items(
+                user_followed_response["artists"], "artists"
+            )
+        ],
+    )
 
 
 def get_all_saved_playlists() -> List[Playlist]:
@@ -515,23 +684,29 @@ def get_all_saved_playlists() -> List[Playlist]:
     if user_playlists_response is None:
         raise SpotifyError("Couldn't get user playlists")
 
-    user_playlists = user_playlists_response["items"]
-    user_id = user_playlists_response["href"].split("users/")[-1].split("/")[0]
+    user_id = user_playlists_response["href"].rpartition("users/")[2].partition("/")[0]
 
-    # Fetch all saved tracks
-    while user_playlists_response and user_playlists_response["next"]:
-        response = spotify_client.next(user_playlists_response)
-        if response is None:
-            break
+    return lists_from_urls(
+        Playlist,
+        [
+            playlist["external_urls"]["spotify"]
+            for playlist in iter_spotify_pages(
+                get_thread_pool(MAX_SPOTIFY_THREADS),
+                spotify_client.current_user_playlists,
+                user_playlists_response,
+            )
+            if playlist["owner"]["id"] != user_id
+        ],
+    )
 
-        user_playlists_response = response
-        user_playlists.extend(user_playlists_response["items"])
 
-    return [
-        Playlist.from_url(playlist["external_urls"]["spotify"], fetch_songs=False)
-        for playlist in user_playlists
-        if playlist["owner"]["id"] != user_id
-    ]
+# Queries that fetch all the lists of a given kind from the user's library
+USER_LIBRARY_QUERIES: Dict[str, Callable[[], Sequence[SongList]]] = {
+    "all-user-playlists": get_all_user_playlists,
+    "all-user-followed-artists": get_user_followed_artists,
+    "all-user-saved-albums": get_user_saved_albums,
+    "all-saved-playlists": get_all_saved_playlists,
+}
 
 
 def reinit_song(song: Song) -> Song:
@@ -546,28 +721,38 @@ def reinit_song(song: Song) -> Song:
     - Updated song object
     """
 
-    data = song.json
-    if data.get("url"):
-        new_data = Song.from_url(data["url"]).json
-    elif data.get("song_id"):
-        new_data = Song.from_url(
-            "https://open.spotify.com/track/" + data["song_id"]
-        ).json
-    elif data.get("name") and data.get("artist"):
-        new_data = Song.from_search_term(f"{data['artist']} - {data['name']}").json
+    # Only Spotify track urls can be fetched directly, songs
+    # with any other url fall back to their id or a search
+    if song.url and "open.spotify.com/track/" in song.url:
+        new_song = Song.from_url(song.url)
+    elif song.song_id:
+        new_song = Song.from_url("https://open.spotify.com/track/" + song.song_id)
+    elif song.name and song.artist:
+        new_song = get_song_from_search_term(f"{song.artist} - {song.name}")
     else:
         raise QueryError("Song object is missing required data to be reinitialized")
 
-    for key in Song.__dataclass_fields__:  # type: ignore # pylint: disable=E1101
-        val = data.get(key)
-        new_val = new_data.get(key)
-        if new_val is not None and val is None:
-            data[key] = new_val
-        elif new_val is not None and val is not None:
-            data[key] = val
+    # The new song isn't used anywhere else, so its fields
+    # can be read directly instead of copying them with asdict
+    return merge_song_data(song.json, vars(new_song))
+
 
-    # return reinitialized song object
-    return Song(**data)
+def reinit_songs(songs: List[Song], threads: int = 1) -> List[Song]:
+    """
+    Update song objects with new data from Spotify,
+    same as `reinit_song` but for many songs at once.
+    Songs with a Spotify track id are fetched with the batch endpoints
+    of the Spotify API, the rest are updated one by one.
+
+    ### Arguments
+    - songs: List of song objects
+    - threads: Number of threads to use (at most `MAX_POOL_THREADS`)
+
+    ### Returns
+    - List of updated song objects, songs that couldn't be updated are skipped
+    """
+
+    return reinit_songs_in_batches(songs, threads, reinit_song)
 
 
 def get_song_from_file_metadata(file: Path, id3_separator: str = "/") -> Optional[Song]:
@@ -589,13 +774,42 @@ def get_song_from_file_metadata(file: Path, id3_separator: str = "/") -> Optiona
     return Song.from_missing_data(**file_metadata)
 
 
-def gather_known_songs(output: str, output_format: str) -> Dict[str, List[Path]]:
+def get_song_from_file(file: Path) -> Optional[Song]:
+    """
+    Get song based on the file metadata,
+    or search for it using the file name if the metadata is missing
+
+    ### Arguments
+    - file: Path to file
+
+    ### Returns
+    - Song object or None if the song couldn't be found
+    """
+
+    # Try to get the song from the metadata
+    song = get_song_from_file_metadata(file)
+
+    # If the songs doesn't have metadata, try to get it from the filename
+    if song is None or song.url is None:
+        search_results = get_search_results(file.stem)
+        if len(search_results) == 0:
+            return None
+
+        song = search_results[0]
+
+    return song
+
+
+def gather_known_songs(
+    output: str, output_format: str, threads: int = 1
+) -> Dict[str, List[Path]]:
     """
     Gather all known songs from the output directory
 
     ### Arguments
     - output: Output path template
     - output_format: Output format
+    - threads: Number of threads to use
 
     ### Returns
     - Dictionary containing all known songs and their paths
@@ -604,28 +818,18 @@ def gather_known_songs(output: str, output_format: str) -> Dict[str, List[Path]]
     # Get the base directory from the path template
     # Path("/Music/test/{artist}/{artists} - {title}.{output-ext}") -> "/Music/test"
     base_dir = output.split("{", 1)[0]
-    paths = Path(base_dir).glob(f"**/*.{output_format}")
-
-    known_songs: Dict[str, List[Path]] = {}
-    for path in paths:
-        # Try to get the song from the metadata
-        song = get_song_from_file_metadata(path)
+    paths = list(Path(base_dir).glob(f"**/*.{output_format}"))
 
-        # If the songs doesn't have metadata, try to get it from the filename
-        if song is None or song.url is None:
-            search_results = get_search_results(path.stem)
-            if len(search_results) == 0:
-                continue
+    # Reading metadata and searching are I/O bound, process the files in parallel
+    songs = get_thread_pool(threads).map(get_song_from_file, paths)
 
-            song = search_results[0]
-
-        known_paths = known_songs.get(song.url)
-        if known_paths is None:
-            known_songs[song.url] = [path]
-        else:
+    known_songs: DefaultDict[str, List[Path]] = defaultdict(list)
+    for path, song in zip(paths, songs):
+        if song is not None:
             known_songs[song.url].append(path)
 
-    return known_songs
+    # Return a plain dict, so that looking up unknown urls doesn't add them
+    return dict(known_songs)
 
 
 def create_ytm_album(url: str, fetch_songs: bool = True) -> Album:
@@ -639,16 +843,16 @@ def create_ytm_album(url: str, fetch_songs: bool = True) -> Album:
     - a list of Song objects
     """
 
-    if "?list=" not in url or not url.startswith("https://music.youtube.com/"):
+    url_match = YTM_ALBUM_URL_REGEX.match(url)
+    if url_match is None:
         raise ValueError(f"Invalid album url: {url}")
 
-    browse_id = get_ytm_client().get_album_browse_id(
-        url.split("?list=")[1].split("&")[0]
-    )
+    ytm_client = get_ytm_client()
+    browse_id = ytm_client.get_album_browse_id(url_match.group(1))
     if browse_id is None:
         raise ValueError(f"Invalid album url: {url}")
 
-    album = get_ytm_client().get_album(browse_id)
+    album = ytm_client.get_album(browse_id)
 
     if album is None:
         raise ValueError(f"Couldn't fetch album: {url}")
@@ -659,7 +863,11 @@ def create_ytm_album(url: str, fetch_songs: bool = True) -> Album:
         "url": url,
     }
 
+    album_name = metadata["name"]
+    album_artist = metadata["artist"]
+
     songs = []
+    urls = []
     for track in album["tracks"]:
         artists = [artist["name"] for artist in track["artists"]]
 
@@ -667,18 +875,26 @@ def create_ytm_album(url: str, fetch_songs: bool = True) -> Album:
             name=track["title"],
             artists=artists,
             artist=artists[0],
-            album_name=metadata["name"],
-            album_artist=metadata["artist"],
+            album_name=album_name,
+            album_artist=album_artist,
             duration=track["duration_seconds"],
             download_url=f"https://music.youtube.com/watch?v={track['videoId']}",
         )
 
-        if fetch_songs:
-            song = Song.from_search_term(f"{song.artist} - {song.name}")
-
         songs.append(song)
+        urls.append(song.url)
+
+    if fetch_songs:
+        # Every song needs its own search, run them concurrently
+        songs = list(
+            get_thread_pool(MAX_SPOTIFY_THREADS).map(
+                lambda song: get_song_from_search_term(f"{song.artist} - {song.name}"),
+                songs,
+            )
+        )
+        urls = [song.url for song in songs]
 
-    return Album(**metadata, songs=songs, urls=[song.url for song in songs])
+    return Album(**metadata, songs=songs, urls=urls)
 
 
 def create_ytm_playlist(url: str, fetch_songs: bool = True) -> Playlist:
@@ -692,15 +908,12 @@ def create_ytm_playlist(url: str, fetch_songs: bool = True) -> Playlist:
     - a Playlist object
     """
 
-    if not ("?list=" in url or "/browse/VLPL" in url) or not url.startswith(
-        "https://music.youtube.com/"
-    ):
+    url_match = YTM_PLAYLIST_URL_REGEX.match(url)
+    if url_match is None:
         raise ValueError(f"Invalid playlist url: {url}")
 
-    if "/browse/VLPL" in url:
-        playlist_id = url.split("/browse/")[1]
-    else:
-        playlist_id = url.split("?list=")[1]
+    # Browse urls take precedence over list urls
+    playlist_id = url_match.group(1) or url_match.group(2)
     playlist = get_ytm_client().get_playlist(playlist_id, None)  # type: ignore
 
     if playlist is None:
@@ -730,35 +943,33 @@ def create_ytm_playlist(url: str, fetch_songs: bool = True) -> Playlist:
     }
 
     songs = []
-    for track in playlist["tracks"]:
-        if track["videoId"] is None or track["isAvailable"] is False:
-            continue
+    urls = []
+    # Unavailable tracks can't be downloaded, skip them up front
+    available_tracks = (
+        track
+        for track in playlist["tracks"]
+        if track.get("videoId") is not None and track.get("isAvailable") is not False
+    )
+    for track in available_tracks:
+        artists = [artist["name"] for artist in track.get("artists") or ()]
+        album = track.get("album")
 
         song = Song.from_missing_data(
             name=track["title"],
-            artists=(
-                [artist["name"] for artist in track["artists"]]
-                if track.get("artists") is not None
-                else []
-            ),
-            artist=(
-                track["artists"][0]["name"]
-                if track.get("artists") is not None
-                else None
-            ),
-            album_name=(
-                track.get("album", {}).get("name")
-                if track.get("album") is not None
-                else None
-            ),
+            artists=artists,
+            artist=artists[0] if artists else None,
+            album_name=album.get("name") if album is not None else None,
             duration=track.get("duration_seconds"),
             explicit=track.get("isExplicit"),
             download_url=f"https://music.youtube.com/watch?v={track['videoId']}",
         )
 
-        if fetch_songs:
-            song = reinit_song(song)
-
         songs.append(song)
+        urls.append(song.url)
+
+    if fetch_songs:
+        # Every song needs its own lookup, run them concurrently
+        songs = list(get_thread_pool(MAX_SPOTIFY_THREADS).map(reinit_song, songs))
+        urls = [song.url for song in songs]
 
-    return Playlist(**metadata, songs=songs, urls=[song.url for song in songs])
+    return Playlist(**metadata, songs=songs, urls=urls)
@@ -8,9 +8,10 @@ spotify.Spotify.init(client_id, client_secret)
 ```
 """
 
+import concurrent.futures
 import json
 import logging
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import requests
 from spotipy import Spotify
@@ -23,10 +24,20 @@ __all__ = [
     "SpotifyError",
     "SpotifyClient",
     "save_spotify_cache",
+    "get_spotify_objects",
+    "iter_spotify_items",
+    "iter_spotify_pages",
 ]
 
 logger = logging.getLogger(__name__)
 
+# Number of connections kept open to the Spotify API,
+# enough for every thread of the search thread pools
+SPOTIFY_POOL_SIZE = 32
+
+# Maximum number of ids accepted by the Spotify API batch endpoints
+SPOTIFY_BATCH_SIZES = {"tracks": 50, "artists": 50, "albums": 20}
+
 
 class SpotifyError(Exception):
     """
@@ -165,6 +176,23 @@ class SpotifyClient(Spotify, metaclass=Singleton):
             with open(cache_file_loc, "w", encoding="utf-8") as cache_file:
                 json.dump(self.cache, cache_file)
 
+    def _build_session(self):
+        """
+        Overrides the session builder of the SpotifyClient.
+        Keeps a connection open for every thread, so that concurrent
+        requests reuse connections instead of opening new ones.
+        """
+
+        super()._build_session()
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=SPOTIFY_POOL_SIZE,
+            pool_maxsize=SPOTIFY_POOL_SIZE,
+            max_retries=self._session.get_adapter("https://").max_retries,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
     def _get(self, url, args=None, payload=None, **kwargs):
         """
         Overrides the get method of the SpotifyClient.
@@ -225,3 +253,115 @@ def save_spotify_cache(cache: Dict[str, Optional[Dict]]):
 
     with open(cache_file_loc, "w", encoding="utf-8") as cache_file:
         json.dump(cache, cache_file)
+
+
+def get_spotify_objects(
+    pool: concurrent.futures.ThreadPoolExecutor, object_type: str, ids: List[str]
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fetch Spotify objects in batches, using the batch endpoints
+    of the Spotify API.
+
+    ### Arguments
+    - pool: thread pool used to fetch the batches
+    - object_type: "tracks", "artists" or "albums"
+    - ids: Spotify ids of the objects
+
+    ### Returns
+    - Dictionary mapping ids to the raw objects, None if an object couldn't be fetched
+    """
+
+    spotify_client = SpotifyClient()
+    fetch = getattr(spotify_client, object_type)
+    batch_size = SPOTIFY_BATCH_SIZES[object_type]
+
+    unique_ids = list(dict.fromkeys(ids))
+    batches = [
+        unique_ids[index : index + batch_size]
+        for index in range(0, len(unique_ids), batch_size)
+    ]
+
+    def fetch_batch(batch: List[str]) -> List[Optional[Dict[str, Any]]]:
+        try:
+            response = fetch(batch)
+        except Exception as exc:
+            logger.debug("Couldn't fetch %s in batch: %s", object_type, exc)
+            return [None] * len(batch)
+
+        if response is None:
+            return [None] * len(batch)
+
+        return response[object_type]
+
+    objects: Dict[str, Optional[Dict[str, Any]]] = {}
+    for batch, items in zip(batches, pool.map(fetch_batch, batches)):
+        objects.update(zip(batch, items))
+
+    return objects
+
+
+def iter_spotify_items(
+    response: Dict[str, Any], key: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the items of a paginated Spotify response,
+    fetching the next page only once the current one is used up.
+
+    ### Arguments
+    - response: the first page of the response
+    - key: key of the paging object in the next responses, if it is nested
+
+    ### Returns
+    - Iterator over the items of all the pages
+    """
+
+    spotify_client = SpotifyClient()
+    page: Optional[Dict[str, Any]] = response
+    while page:
+        yield from page["items"]
+
+        if not page["next"]:
+            break
+
+        next_response = spotify_client.next(page)
+        if next_response is None:
+            break
+
+        page = next_response[key] if key else next_response
+
+
+def iter_spotify_pages(
+    pool: concurrent.futures.ThreadPoolExecutor,
+    fetch_page: Callable[..., Optional[Dict[str, Any]]],
+    response: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the items of a paginated Spotify response.
+    The first page tells how many items there are, so the
+    remaining pages are requested concurrently by their offset.
+
+    ### Arguments
+    - pool: thread pool used to fetch the pages
+    - fetch_page: function that fetches a page, given `limit` and `offset`
+    - response: the first page of the response
+
+    ### Returns
+    - Iterator over the items of all the pages, in order
+    """
+
+    yield from response["items"]
+
+    limit = response["limit"]
+    if not limit or not response["next"]:
+        return
+
+    offsets = range(response["offset"] + limit, response["total"], limit)
+
+    # 429 responses are retried by spotipy, honoring Retry-After
+    for page in pool.map(
+        lambda offset: fetch_page(limit=limit, offset=offset), offsets
+    ):
+        if page is None:
+            break
+
+        yield from page["items"]
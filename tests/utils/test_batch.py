@@ -0,0 +1,23 @@
+from spotdl.types.song import Song
+from spotdl.utils.batch import get_song_from_search_term, search_song
+
+
+def test_get_song_from_search_term(monkeypatch):
+    calls = []
+
+    def from_search_term(search_term):
+        calls.append(search_term)
+        return Song.from_missing_data(name="Song", artists=["Artist"])
+
+    monkeypatch.setattr(Song, "from_search_term", from_search_term)
+    search_song.cache_clear()
+
+    first = get_song_from_search_term("Artist - Song")
+    second = get_song_from_search_term("Artist - Song")
+
+    assert calls == ["Artist - Song"]
+    assert first == second
+    assert first is not second
+    assert first.artists is not second.artists
+
+    search_song.cache_clear()
@@ -2,7 +2,18 @@ import pytest
 
 from spotdl.types.saved import SavedError
 from spotdl.types.song import Song
-from spotdl.utils.search import get_search_results, get_simple_songs, parse_query
+from spotdl.utils.search import (
+    YTM_ALBUM_URL_REGEX,
+    YTM_PLAYLIST_URL_REGEX,
+    classify_query,
+    filter_songs,
+    get_search_results,
+    get_simple_songs,
+    get_spotify_url_type,
+    parse_query,
+    reinit_songs,
+)
+from spotdl.utils.spotify import SpotifyClient
 
 SONG = ["https://open.spotify.com/track/2Ikdgh3J5vCRmnCL3Xcrtv"]
 PLAYLIST = ["https://open.spotify.com/playlist/78Lg6HmUqlTnmipvNxc536"]
@@ -89,3 +100,132 @@ def test_create_empty_song():
 def test_get_simple_songs():
     songs = get_simple_songs(QUERY)
     assert len(songs) > 1
+
+
+def test_classify_query():
+    assert classify_query(SONG[0]) == {"open.spotify.com", "track"}
+    assert classify_query(ALBUM_SEARCH[0]) == {"album", "album:"}
+    assert classify_query(YT[0]) == {"|", "watch?v=", "open.spotify.com", "track"}
+    assert classify_query("saved") == frozenset()
+
+
+def test_get_spotify_url_type():
+    for url, url_type in [
+        (SONG[0], "track"),
+        (PLAYLIST[0], "playlist"),
+        (ALBUM[0], "album"),
+        (ARTIST[0], "artist"),
+        ("https://open.spotify.com/user/spotify", "user"),
+        ("https://open.spotify.com/embed/track/2Ikdgh3J5vCRmnCL3Xcrtv", "track"),
+        (ALBUM_SEARCH[0], None),
+    ]:
+        assert get_spotify_url_type(url, classify_query(url)) == url_type
+
+
+def test_reinit_songs(monkeypatch):
+    track = {
+        "id": "2Ikdgh3J5vCRmnCL3Xcrtv",
+        "name": "Song",
+        "artists": [{"id": "artist", "name": "Artist"}],
+        "album": {"id": "album"},
+        "disc_number": 1,
+        "duration_ms": 180000,
+        "track_number": 1,
+        "explicit": False,
+        "popularity": 50,
+        "external_ids": {"isrc": "USUM71900001"},
+        "external_urls": {"spotify": SONG[0]},
+    }
+    artist = {"id": "artist", "genres": ["pop"]}
+    album = {
+        "id": "album",
+        "name": "Album",
+        "artists": [{"name": "Artist"}],
+        "album_type": "album",
+        "copyrights": [],
+        "genres": [],
+        "tracks": {"items": [{"disc_number": 1}]},
+        "release_date": "2020-01-01",
+        "total_tracks": 1,
+        "label": "Label",
+        "images": [],
+    }
+
+    spotify_client = SpotifyClient()
+    calls = []
+    for object_type, obj in [("tracks", track), ("artists", artist), ("albums", album)]:
+        monkeypatch.setattr(
+            spotify_client,
+            object_type,
+            lambda ids, key=object_type, obj=obj: calls.append(key)
+            or {key: [obj for _ in ids]},
+        )
+
+    songs = reinit_songs(
+        [
+            Song.from_missing_data(url=SONG[0], lyrics="lyrics"),
+            Song.from_missing_data(song_id="2Ikdgh3J5vCRmnCL3Xcrtv"),
+        ]
+    )
+
+    assert calls == ["tracks", "artists", "albums"]
+    assert [song.name for song in songs] == ["Song", "Song"]
+    assert songs[0].lyrics == "lyrics"
+    assert songs[0].genres == ["pop"]
+
+
+def test_filter_songs():
+    songs = [
+        Song.from_missing_data(name="1", album_name="Album", album_type="album"),
+        Song.from_missing_data(name="2", album_name="Album (Live)", album_type="album"),
+        Song.from_missing_data(name="3", album_name="Single", album_type="single"),
+        Song.from_missing_data(name="4", album_name="Deluxe", album_type="single"),
+    ]
+
+    def names(filtered):
+        return [song.name for song in filtered]
+
+    assert names(filter_songs(songs)) == ["1", "2", "3", "4"]
+    assert names(filter_songs(songs, albums_to_ignore=["live"])) == ["1", "3", "4"]
+
+    # Keywords are matched case-insensitively and literally
+    assert names(filter_songs(songs, albums_to_ignore=["Live", "DELUXE"])) == [
+        "1",
+        "3",
+    ]
+    assert names(filter_songs(songs, albums_to_ignore=["(live)"])) == ["1", "3", "4"]
+    assert names(filter_songs(songs, albums_to_ignore=["a.b"])) == ["1", "2", "3", "4"]
+
+    assert names(filter_songs(songs, album_type="single")) == ["3", "4"]
+    assert names(
+        filter_songs(songs, albums_to_ignore=["deluxe"], album_type="single")
+    ) == ["3"]
+
+
+@pytest.mark.parametrize(
+    "url, album_id, playlist_id",
+    [
+        ("https://music.youtube.com/playlist?list=PLabc", "PLabc", "PLabc"),
+        ("https://music.youtube.com/playlist?list=PLabc&si=xyz", "PLabc", "PLabc"),
+        (
+            "https://music.youtube.com/playlist?list=OLAK5uy_abc&si=xyz",
+            "OLAK5uy_abc",
+            "OLAK5uy_abc",
+        ),
+        ("https://music.youtube.com/browse/VLPLabc", None, "VLPLabc"),
+        ("https://music.youtube.com/browse/VLPLabc?si=xyz", None, "VLPLabc"),
+        ("https://music.youtube.com/browse/MPREabc", None, None),
+        ("https://www.youtube.com/playlist?list=PLabc", None, None),
+        ("https://music.youtube.com.evil.com/playlist?list=PLabc", None, None),
+        ("https://music.youtube.com/watch?v=abc", None, None),
+        ("https://music.youtube.com/playlist?foo=PLabc", None, None),
+    ],
+)
+def test_ytm_list_url_regexes(url, album_id, playlist_id):
+    album_match = YTM_ALBUM_URL_REGEX.match(url)
+    assert (album_match.group(1) if album_match else None) == album_id
+
+    playlist_match = YTM_PLAYLIST_URL_REGEX.match(url)
+    assert (
+        (playlist_match.group(1) or playlist_match.group(2)) if playlist_match else None
+    ) == playlist_id
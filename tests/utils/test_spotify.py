@@ -1,6 +1,13 @@
+import concurrent.futures
+
 import pytest
 
-from spotdl.utils.spotify import SpotifyClient, SpotifyError
+from spotdl.utils.spotify import (
+    SpotifyClient,
+    SpotifyError,
+    iter_spotify_items,
+    iter_spotify_pages,
+)
 
 
 def test_init(patch_dependencies):
@@ -37,3 +44,39 @@ def test_multiple_init():
             user_auth=False,
             no_cache=True,
         )
+
+
+def test_iter_spotify_items(monkeypatch):
+    """
+    Test iterating over the items of a paginated response
+    """
+
+    pages = {
+        "page2": {"artists": {"items": [3, 4], "next": "page3"}},
+        "page3": {"artists": {"items": [5], "next": None}},
+    }
+
+    spotify_client = SpotifyClient()
+    monkeypatch.setattr(spotify_client, "next", lambda page: pages[page["next"]])
+
+    first_page = {"items": [1, 2], "next": "page2"}
+    assert list(iter_spotify_items(first_page, "artists")) == [1, 2, 3, 4, 5]
+    assert list(iter_spotify_items({"items": [1], "next": None})) == [1]
+
+
+def test_iter_spotify_pages():
+    """
+    Test fetching the pages of a paginated response by their offset
+    """
+
+    items = list(range(11))
+
+    def fetch_page(limit, offset):
+        return {"items": items[offset : offset + limit]}
+
+    first_page = {"items": items[:4], "limit": 4, "offset": 0, "total": 11, "next": "x"}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        assert list(iter_spotify_pages(pool, fetch_page, first_page)) == items
+
+        last_page = {"items": [1], "limit": 4, "offset": 0, "total": 1, "next": None}
+        assert list(iter_spotify_pages(pool, fetch_page, last_page)) == [1]